@@ -22,12 +22,388 @@ Simple usage:
     plot.save("my_interactive_plot.html")
 """
 
+import functools
+import io
+import re
 from pathlib import Path
 
 import datamapplot
+import numpy as np
 import orjson
 import pandas as pd
 
+# Options for every orjson.dumps of the detail data
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Details with more rows than this are serialized one column at a time
+_STREAM_ROWS_THRESHOLD = 100_000
+
+# Columns missing more than this fraction of values are sent as {row: value}
+_SPARSE_MISSING_FRACTION = 0.5
+
+# String forms of cluster labels that mean "no cluster"
+_INVALID_CLUSTER_LABELS = ["", "-1", "None", "null", "nan"]
+
+# Script passed to datamapplot as custom_js. {CUSTOM_JS_BASE} and
+# {EXTRA_DATA_JSON} are plain placeholders filled with bytes.replace; the
+# latter sits inside a single-quoted string, see _js_string_contents().
+_ENHANCED_JS_TEMPLATE = b"""
+{CUSTOM_JS_BASE}
+
+// Inject the detailed data for all points. JSON.parse on a string literal
+// loads large payloads faster than the equivalent object literal.
+window.pointDetailsData = JSON.parse('{EXTRA_DATA_JSON}');
+
+// Field labels and link columns are precomputed in Python so clicks do no
+// string formatting or URL sniffing on other fields
+window.pointDetailsLabels = window.pointDetailsData?.labels || {};
+window.pointDetailsUrlFields = new Set(window.pointDetailsData?.url_columns || []);
+
+// Fields that are shown elsewhere in the panel, or not at all
+window._skipFields = new Set(['index', 'title', 'name', '_cluster_info']);
+
+// Sparse indices get a point index -> row lookup, built once at load time.
+// A null index means rows are already in point order.
+window.pointDetailsRows = null;
+if (window.pointDetailsData?.index) {
+    window.pointDetailsRows = new Map();
+    window.pointDetailsData.index.forEach((pointIndex, row) => {
+        if (!window.pointDetailsRows.has(pointIndex)) {
+            window.pointDetailsRows.set(pointIndex, row);
+        }
+    });
+}
+
+// Rebuild the record for a single point from the column-oriented data
+window.getPointDetails = function(pointIndex) {
+    const data = window.pointDetailsData;
+    if (!data || pointIndex === undefined) return null;
+    
+    let detailData = null;
+    const rows = window.pointDetailsRows;
+    const row = rows ? rows.get(pointIndex) ?? -1 : pointIndex;
+    if (row >= 0 && row < data.num_rows) {
+        detailData = { index: pointIndex };
+        // Mostly-empty columns arrive as {row: value} objects; rows they
+        // lack read as undefined and are skipped like null
+        for (const [key, values] of Object.entries(data.columns)) {
+            detailData[key] = values[row];
+        }
+    }
+    
+    let clusterInfo = null;
+    for (const [level, { names, codes }] of Object.entries(data.clusters)) {
+        const code = codes[pointIndex];
+        if (code === undefined || code < 0) continue;
+        clusterInfo = clusterInfo || {};
+        clusterInfo[level] = names[code];
+    }
+    if (clusterInfo) {
+        detailData = detailData || { index: pointIndex };
+        detailData._cluster_info = clusterInfo;
+    }
+    
+    return detailData;
+};
+
+// Override the showPointDetails function to use our enhanced data
+window.showPointDetails = function(hoverText, pointIndex) {
+    const panel = document.getElementById('detail-panel');
+    const content = document.getElementById('detail-panel-content');
+    
+    // Get enhanced data for this point
+    const detailData = window.getPointDetails(pointIndex);
+    
+    // Build content using array for performance
+    const parts = [];
+    
+    // Add title
+    const title = detailData?.title || detailData?.name || `Point #${pointIndex + 1}`;
+    parts.push(`<div class="detail-title">${title}</div>`);
+    parts.push('<div class="detail-metadata">');
+    
+    // Add cluster information if present
+    if (detailData && detailData._cluster_info) {
+        parts.push('<div class="detail-section">');
+        parts.push('<div class="detail-label">Clusters</div>');
+        parts.push('<div class="detail-value">');
+        for (const [level, label] of Object.entries(detailData._cluster_info)) {
+            parts.push(`<div>${level}: <strong>${label}</strong></div>`);
+        }
+        parts.push('</div></div>');
+    }
+    
+    // Add all other fields
+    if (detailData) {
+        for (const [key, value] of Object.entries(detailData)) {
+            if (window._skipFields.has(key) || value == null) continue;
+            
+            // Format field name
+            const label = window.pointDetailsLabels[key] || key;
+            
+            // Format value
+            let displayValue = value;
+            if (Array.isArray(value)) {
+                displayValue = value.join(', ');
+            } else if (typeof value === 'object') {
+                displayValue = JSON.stringify(value, null, 2);
+            } else if (window.pointDetailsUrlFields.has(key) && typeof value === 'string' && value.startsWith('http')) {
+                displayValue = `<a href="${value}" target="_blank" rel="noopener">${value}</a>`;
+            }
+            
+            parts.push(`
+                <div class="detail-section">
+                    <div class="detail-label">${label}</div>
+                    <div class="detail-value">${displayValue}</div>
+                </div>
+            `);
+        }
+    }
+    
+    // Show basic hover info if no detail data
+    if (!detailData) {
+        parts.push('<div class="detail-section">');
+        parts.push('<div class="detail-value">');
+        parts.push(hoverText || 'No details available');
+        parts.push('</div></div>');
+    }
+    
+    parts.push('</div>');
+    
+    content.innerHTML = parts.join('');
+    panel.classList.add('active');
+};
+"""
+
+
+@functools.lru_cache(maxsize=8)
+def _read_asset(path_str, mtime):
+    """Read an asset file, cached per (path, mtime) so edits are picked up."""
+    return Path(path_str).read_bytes()
+
+
+def _load_assets():
+    """Return the custom_js.js (bytes) and on_click.js (str) assets."""
+    js_dir = Path(__file__).parent
+    custom_js_path = js_dir / "custom_js.js"
+    on_click_path = js_dir / "on_click.js"
+    custom_js_base = _read_asset(str(custom_js_path), custom_js_path.stat().st_mtime)
+    on_click_template = _read_asset(str(on_click_path), on_click_path.stat().st_mtime)
+    return custom_js_base, on_click_template.decode("utf-8")
+
+
+def _column_key(col):
+    """Return the JSON key for a column, shared by columns, labels and links."""
+    return str(col)
+
+
+def _field_label(key):
+    """Format a column key for display, e.g. "paper_URL" -> "Paper URL"."""
+    # ASCII word characters, as in the JavaScript /\b\w/g this replaces
+    return re.sub(
+        r"\b\w", lambda m: m.group().upper(), key.replace("_", " "), flags=re.ASCII
+    )
+
+
+def _column_values(series):
+    """
+    Return the values of a column in a form orjson can serialize.
+
+    Numeric and boolean columns, including pandas' nullable extension types,
+    are returned as contiguous ndarrays so they go through orjson's numpy
+    path without boxing each value; missing numbers become NaN, which is
+    serialized as null. Nullable booleans with missing values, and
+    everything else, fall back to a list with missing values as None.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in "biu" or dtype in (np.float32, np.float64):
+            return np.ascontiguousarray(series.to_numpy())
+    elif pd.api.types.is_numeric_dtype(dtype) and hasattr(dtype, "numpy_dtype"):
+        # Nullable Int64/Float64/boolean and Arrow numerics; their pd.NA is
+        # not serializable. Other numeric extension types, such as sparse,
+        # take the generic fallback below.
+        if not series.hasnans:
+            return series.to_numpy(dtype=dtype.numpy_dtype)
+        if pd.api.types.is_bool_dtype(dtype):
+            # Keep true/false rather than 1.0/0.0; NA becomes None
+            return series.to_numpy(dtype=object, na_value=None).tolist()
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    # Map every missing value (None, NaN, pd.NA, NaT) to None, as
+    # to_dict("records") did; orjson cannot serialize pd.NA
+    return series.to_numpy(dtype=object, na_value=None).tolist()
+
+
+def _column_payload(series):
+    """
+    Return a column's values for the payload.
+
+    Columns that are mostly missing (e.g. an optional doi) are sent as a
+    {row: value} map of their present values instead of a null-padded list.
+    """
+    missing = series.isna().to_numpy()
+    if np.count_nonzero(missing) > len(missing) * _SPARSE_MISSING_FRACTION:
+        rows = np.flatnonzero(~missing)
+        return dict(zip(rows.tolist(), series.iloc[rows].tolist()))
+    return _column_values(series)
+
+
+def _is_dense_index(index):
+    """Return True if the index values are exactly 0..n-1 in order."""
+    values = index.to_numpy()
+    return values.dtype.kind in "iu" and np.array_equal(values, np.arange(len(values)))
+
+
+def _has_urls(series):
+    """Return True if a column contains any http(s) links among its strings."""
+    try:
+        # Works on object (including mixed) and categorical columns
+        return bool(series.str.startswith("http", na=False).any())
+    except AttributeError:
+        # .str refuses columns without string values, e.g. numeric ones
+        return False
+
+
+def _encode_cluster_layer(layer, num_points):
+    """
+    Encode a cluster layer as its distinct labels plus one code per point.
+
+    Returns a dict with "names", the valid labels as str, and "codes", an
+    index into names for each point. Missing or noise labels (and points
+    beyond the end of the layer) get code -1 so the detail panel skips them.
+    Labels are converted to str once per distinct value, not once per point.
+    """
+    values = np.asarray(layer)[:num_points]
+    if values.dtype.kind == "O":
+        # np.unique cannot sort mixed Python objects such as str and None.
+        # Hash them instead of copying the whole layer via astype(str);
+        # missing values (None/NaN) get inverse code -1.
+        inverse, unique = pd.factorize(values)
+    else:
+        unique, inverse = np.unique(values, return_inverse=True)
+    names = [str(value) for value in unique]
+    # Integer layers only need comparing against the -1 noise label;
+    # anything else is compared by its str form
+    if unique.dtype.kind == "i":
+        valid = unique != -1
+    else:
+        valid = ~np.isin(names, _INVALID_CLUSTER_LABELS)
+
+    # Renumber so codes index into the valid names only
+    remap = np.where(valid, np.cumsum(valid) - 1, -1).astype(np.int64)
+    # Trailing -1 so factorize's missing code wraps around to "no cluster"
+    remap = np.append(remap, -1)
+    # Gather straight into the preallocated codes (points past the end of the
+    # layer keep -1); an explicit mode avoids np.take buffering the output
+    codes = np.full(num_points, -1, dtype=np.int64)
+    np.take(remap, inverse.ravel(), out=codes[: len(values)], mode="wrap")
+    return {
+        "names": [name for name, ok in zip(names, valid) if ok],
+        "codes": codes,
+    }
+
+
+def _dumps_streaming_columns(extra_data, columns):
+    """
+    Serialize extra_data with the (key, series) columns as its "columns" entry.
+
+    Columns are converted and serialized one at a time into a buffer, so only
+    a single column's values are held in memory at once instead of the
+    whole frame's.
+    """
+    buf = io.BytesIO()
+    buf.write(b'{"columns":{')
+    for i, (key, series) in enumerate(columns):
+        if i:
+            buf.write(b",")
+        buf.write(orjson.dumps(key))
+        buf.write(b":")
+        buf.write(orjson.dumps(_column_payload(series), option=_ORJSON_OPTIONS))
+    buf.write(b"},")
+    # Splice in the remaining fields, minus their opening brace
+    rest = {key: value for key, value in extra_data.items() if key != "columns"}
+    buf.write(orjson.dumps(rest, option=_ORJSON_OPTIONS)[1:])
+    return buf.getvalue()
+
+
+def _serialize_details(data_map, details_df, label_layers):
+    """Serialize the detail panel data for all points to JSON bytes."""
+    # Convert DataFrame to the format expected by the JavaScript. Data is sent
+    # column-wise so orjson can serialize numeric columns straight from their
+    # arrays; rows are reassembled per click in getPointDetails.
+    extra_data = {
+        "index": None,
+        "num_rows": 0,
+        "columns": {},
+        "labels": {},
+        "url_columns": [],
+        "clusters": {},
+    }
+    stream_columns = None
+    if details_df is not None:
+        # Read the index directly rather than through reset_index(), which
+        # would copy the whole frame just to add one column
+        frame = details_df
+        extra_data["num_rows"] = len(frame)
+        columns = [(_column_key(col), series) for col, series in frame.items()]
+        # An unnamed index gives the point each row belongs to; dense 0..n-1
+        # indices are already in point order, so only send it when sparse.
+        # A named index, or each level of a MultiIndex, is shown as a leading
+        # field named as reset_index() names it, and rows stay in order.
+        index = frame.index
+        if isinstance(index, pd.MultiIndex):
+            columns[:0] = [
+                (
+                    _column_key(f"level_{i}" if name is None else name),
+                    index.get_level_values(i).to_series(),
+                )
+                for i, name in enumerate(index.names)
+            ]
+        elif index.name is not None:
+            columns.insert(0, (_column_key(index.name), index.to_series()))
+        elif not _is_dense_index(index):
+            extra_data["index"] = _column_values(index)
+        extra_data["labels"] = {key: _field_label(key) for key, _ in columns}
+        extra_data["url_columns"] = [
+            key for key, series in columns if _has_urls(series)
+        ]
+        # Large frames are streamed column by column at serialization time
+        if len(frame) <= _STREAM_ROWS_THRESHOLD:
+            extra_data["columns"] = {
+                key: _column_payload(series) for key, series in columns
+            }
+        else:
+            stream_columns = columns
+
+    # Add cluster information if provided
+    if label_layers:
+        num_points = data_map.shape[0] if hasattr(data_map, "shape") else len(data_map)
+
+        extra_data["clusters"] = {
+            f"Cluster Level {idx + 1}": _encode_cluster_layer(layer, num_points)
+            for idx, layer in enumerate(label_layers)
+            if layer is not None
+        }
+
+    # Serialize data efficiently with orjson
+    if stream_columns is None:
+        return orjson.dumps(extra_data, option=_ORJSON_OPTIONS)
+    return _dumps_streaming_columns(extra_data, stream_columns)
+
+
+def _js_string_contents(json_bytes):
+    """
+    Escape JSON bytes for use inside a single-quoted JavaScript string.
+
+    orjson never emits raw line breaks, so only backslashes and quotes need
+    escaping for the string itself. Every "<" is also written as \\x3c so
+    the data cannot open or close tags (such as "<!--<script" or
+    "</script>") as far as the HTML parser is concerned.
+    """
+    return (
+        json_bytes.replace(b"\\", b"\\\\").replace(b"'", b"\\'").replace(b"<", b"\\x3c")
+    )
+
 
 def create_interactive_plot(
     data_map,
@@ -111,144 +487,34 @@ def create_interactive_plot(
 
     # Prepare hover text
     if hover_text is None and details_df is not None:
-        # Use first column as hover text if not specified
-        hover_text = details_df.iloc[:, 0].astype(str).values
-
-    # Convert DataFrame to the format expected by the JavaScript
-    extra_data = []
-    if details_df is not None:
-        extra_data = details_df.reset_index().to_dict("records")
-        # Ensure each record has an index
-        for i, record in enumerate(extra_data):
-            if "index" not in record:
-                record["index"] = i
-
-    # Add cluster information if provided
-    if label_layers:
-        num_points = (
-            len(data_map) if hasattr(data_map, "__len__") else data_map.shape[0]
-        )
-
-        # Create or update extra_data with cluster info
-        extra_data_dict = {d.get("index", i): d for i, d in enumerate(extra_data)}
-
-        for i in range(num_points):
-            if i not in extra_data_dict:
-                extra_data_dict[i] = {"index": i}
-
-            # Add cluster labels efficiently
-            cluster_info = {
-                f"Cluster Level {idx + 1}": str(layer[i])
-                for idx, layer in enumerate(label_layers)
-                if layer is not None
-                and i < len(layer)
-                and layer[i]
-                and str(layer[i]) not in ["", "-1", "None", "null"]
-            }
-
-            if cluster_info:
-                extra_data_dict[i]["_cluster_info"] = cluster_info
-
-        extra_data = list(extra_data_dict.values())
+        # Use first column as hover text if not specified. Columns that
+        # already hold strings are used as-is rather than copied via astype.
+        first_col = details_df.iloc[:, 0]
+        if pd.api.types.is_string_dtype(first_col):
+            hover_text = first_col.to_numpy(copy=False)
+        else:
+            hover_text = first_col.astype(str).to_numpy()
+
+    # Plots without details or clusters only show the hover text, so skip
+    # building and serializing the detail data altogether
+    if details_df is None and not label_layers:
+        extra_data_json = b"null"
+    else:
+        extra_data_json = _serialize_details(data_map, details_df, label_layers)
 
     # Load JavaScript assets
-    js_dir = Path(__file__).parent
-    custom_js_path = js_dir / "custom_js.js"
-    on_click_path = js_dir / "on_click.js"
-
-    # Read base JavaScript
-    with open(custom_js_path, "r") as f:
-        custom_js_base = f.read()
-
-    with open(on_click_path, "r") as f:
-        on_click_template = f.read()
-
-    # Serialize data efficiently with orjson
-    extra_data_json = orjson.dumps(extra_data, option=orjson.OPT_NON_STR_KEYS).decode(
-        "utf-8"
+    custom_js_base, on_click_template = _load_assets()
+
+    # Create the enhanced JavaScript. Work in bytes so the orjson output is
+    # spliced in without an intermediate str copy; the payload goes in last
+    # so only the template is scanned. datamapplot templates custom_js as
+    # str, so decode once at the end.
+    enhanced_js = (
+        _ENHANCED_JS_TEMPLATE.replace(b"{CUSTOM_JS_BASE}", custom_js_base)
+        .replace(b"{EXTRA_DATA_JSON}", _js_string_contents(extra_data_json))
+        .decode("utf-8")
     )
 
-    # Create the enhanced JavaScript
-    enhanced_js = f"""
-{custom_js_base}
-
-// Inject the detailed data for all points
-window.pointDetailsData = {extra_data_json};
-
-// Override the showPointDetails function to use our enhanced data
-window.showPointDetails = function(hoverText, pointIndex) {{
-    const panel = document.getElementById('detail-panel');
-    const content = document.getElementById('detail-panel-content');
-    
-    // Get enhanced data for this point
-    let detailData = null;
-    if (window.pointDetailsData && pointIndex !== undefined) {{
-        detailData = window.pointDetailsData.find(d => d.index === pointIndex);
-    }}
-    
-    // Build content using array for performance
-    const parts = [];
-    
-    // Add title
-    const title = detailData?.title || detailData?.name || `Point #${{pointIndex + 1}}`;
-    parts.push(`<div class="detail-title">${{title}}</div>`);
-    parts.push('<div class="detail-metadata">');
-    
-    // Add cluster information if present
-    if (detailData && detailData._cluster_info) {{
-        parts.push('<div class="detail-section">');
-        parts.push('<div class="detail-label">Clusters</div>');
-        parts.push('<div class="detail-value">');
-        for (const [level, label] of Object.entries(detailData._cluster_info)) {{
-            parts.push(`<div>${{level}}: <strong>${{label}}</strong></div>`);
-        }}
-        parts.push('</div></div>');
-    }}
-    
-    // Add all other fields
-    if (detailData) {{
-        const skipFields = ['index', 'title', 'name', '_cluster_info'];
-        
-        for (const [key, value] of Object.entries(detailData)) {{
-            if (skipFields.includes(key) || value == null) continue;
-            
-            // Format field name
-            const label = key.replace(/_/g, ' ').replace(/\\b\\w/g, l => l.toUpperCase());
-            
-            // Format value
-            let displayValue = value;
-            if (Array.isArray(value)) {{
-                displayValue = value.join(', ');
-            }} else if (typeof value === 'object') {{
-                displayValue = JSON.stringify(value, null, 2);
-            }} else if (typeof value === 'string' && value.startsWith('http')) {{
-                displayValue = `<a href="${{value}}" target="_blank" rel="noopener">${{value}}</a>`;
-            }}
-            
-            parts.push(`
-                <div class="detail-section">
-                    <div class="detail-label">${{label}}</div>
-                    <div class="detail-value">${{displayValue}}</div>
-                </div>
-            `);
-        }}
-    }}
-    
-    // Show basic hover info if no detail data
-    if (!detailData) {{
-        parts.push('<div class="detail-section">');
-        parts.push('<div class="detail-value">');
-        parts.push(hoverText || 'No details available');
-        parts.push('</div></div>');
-    }}
-    
-    parts.push('</div>');
-    
-    content.innerHTML = parts.join('');
-    panel.classList.add('active');
-}};
-"""
-
     # Create the plot with all enhancements
     plot = datamapplot.create_interactive_plot(
         data_map,
@@ -300,8 +566,6 @@ def plot_with_dataframe(data_map, df, title_column=None, **kwargs):
 
 if __name__ == "__main__":
     # Example usage
-    import numpy as np
-
     # Create sample data
     n_points = 100
     data_2d = np.random.randn(n_points, 2) * 10